@@ -26,11 +26,14 @@ Controls:
     q      : Quit game
 """
 
+import atexit
 import pygame
+import random
 import sys
 import os
-from dataclasses import dataclass, field
-from typing import List, Tuple
+import time
+from collections import deque
+from typing import Deque, List, NamedTuple, Optional, Set, Tuple
 
 # Constants
 SCREEN_WIDTH = 800
@@ -38,7 +41,9 @@ SCREEN_HEIGHT = 600
 GRID_SIZE = 20
 GRID_WIDTH = SCREEN_WIDTH // GRID_SIZE
 GRID_HEIGHT = SCREEN_HEIGHT // GRID_SIZE
-SNAKE_SPEED = 15
+SNAKE_SPEED = 15  # game logic steps per second
+RENDER_FPS = 60  # input and drawing rate while playing
+IDLE_FPS = 10  # input and drawing rate while paused or game over
 
 # Colors
 COLOR_BG = (0, 0, 0)
@@ -48,14 +53,7 @@ COLOR_SCORE = (255, 255, 255)
 COLOR_GAME_OVER = (255, 0, 0)
 COLOR_PAUSE = (0, 0, 0)
 
-@dataclass
-class SnakeSegment:
-    """Represents a single segment of the snake."""
-    x: int
-    y: int
-
-@dataclass
-class Position:
+class Position(NamedTuple):
     """Represents a game position with x, y coordinates."""
     x: int
     y: int
@@ -66,70 +64,134 @@ class SnakeGame:
     def __init__(self):
         """Initialize the game."""
         pygame.init()
-        self.screen = pygame.display.set_mode((SCREEN_WIDTH, SCREEN_HEIGHT))
+        flags = pygame.DOUBLEBUF | pygame.SCALED
+        try:
+            self.screen = pygame.display.set_mode((SCREEN_WIDTH, SCREEN_HEIGHT), flags, vsync=1)
+        except pygame.error:
+            # Not every driver can give us vsync; fall back to an unsynced window
+            self.screen = pygame.display.set_mode((SCREEN_WIDTH, SCREEN_HEIGHT), flags)
         pygame.display.set_caption("Snake Game")
         self.clock = pygame.time.Clock()
         self.font = pygame.font.SysFont("Arial", 24, bold=True)
         self.game_over_font = pygame.font.SysFont("Arial", 48, bold=True)
 
+        # Only queue the events we handle so SDL drops mouse motion and the like
+        self._events_mask = [pygame.QUIT, pygame.KEYDOWN, pygame.MOUSEBUTTONDOWN, pygame.WINDOWEXPOSED]
+        pygame.event.set_blocked(None)
+        pygame.event.set_allowed(self._events_mask)
+
+        # Movement keys mapped to their direction
+        up, down, left, right = Position(0, -1), Position(0, 1), Position(-1, 0), Position(1, 0)
+        self._dir_table = {
+            pygame.K_UP: up, pygame.K_w: up,
+            pygame.K_DOWN: down, pygame.K_s: down,
+            pygame.K_LEFT: left, pygame.K_a: left,
+            pygame.K_RIGHT: right, pygame.K_d: right,
+        }
+
+        # Text that never changes is rendered once up front
+        self._game_over_text = self.game_over_font.render("GAME OVER", True, COLOR_GAME_OVER)
+        self._restart_text = self.font.render("Click to restart or press any key", True, (150, 150, 150))
+        self._pause_text = self.game_over_font.render("PAUSED", True, COLOR_PAUSE)
+
+        # Translucent game-over overlay, allocated and filled once
+        self._overlay = pygame.Surface((SCREEN_WIDTH, SCREEN_HEIGHT), pygame.SRCALPHA)
+        self._overlay.fill((0, 0, 0, 180))
+
+        # Pixel offset of each grid row/column, so drawing never multiplies
+        self._px = [i * GRID_SIZE for i in range(max(GRID_WIDTH, GRID_HEIGHT))]
+
+        # One snake cell, blitted for every segment
+        self._snake_tile = pygame.Surface((GRID_SIZE - 2, GRID_SIZE - 2))
+        self._snake_tile.fill(COLOR_SNAKE)
+
+        # (value, surface) pairs, re-rendered only when the value changes
+        self._score_cache: Tuple[int, Optional[pygame.Surface]] = (-1, None)
+        self._hs_cache: Tuple[int, Optional[pygame.Surface]] = (-1, None)
+        self._game_over_surf: Optional[pygame.Surface] = None  # built in _handle_game_over
+
+        # Redraw bookkeeping: _draw only runs while _dirty is set, and repaints
+        # just _dirty_cells unless something forced a full redraw
+        self._dirty = True
+        self._full_redraw = True
+        self._dirty_cells: List[int] = []  # packed cell keys
+        self._hud_rects: List[pygame.Rect] = []
+
         # Game state
-        self.snake: List[SnakeSegment] = []
+        # Segments are packed y * GRID_WIDTH + x cell keys, head first
+        self.snake: Deque[int] = deque()
+        self.occupied: Set[int] = set()  # the same keys, for O(1) collision checks
         self.food: Position = Position(0, 0)
         self.direction: Position = Position(1, 0)
         self.next_direction: Position = Position(1, 0)
         self.score = 0
+        # Resolved once, next to this file, so it doesn't depend on the working directory
+        self._hs_path = os.path.join(os.path.dirname(os.path.abspath(__file__)), "highscore.txt")
         self.high_score = self._load_high_score()
+        self._saved_high_score = self.high_score
         self.game_over = False
         self.paused = False
 
+        # Persist the high score once on exit rather than on every game over
+        atexit.register(self._save_high_score)
+
         self._reset_game()
 
     def _load_high_score(self) -> int:
         """Load high score from file."""
-        if os.path.exists("snake/highscore.txt"):
-            try:
-                with open("snake/highscore.txt", "r") as f:
-                    return int(f.read())
-            except (ValueError, IOError):
-                return 0
-        return 0
+        try:
+            with open(self._hs_path, "r") as f:
+                return int(f.read())
+        except (ValueError, IOError):
+            return 0
 
     def _save_high_score(self):
-        """Save high score to file."""
-        with open("snake/highscore.txt", "w") as f:
+        """Save high score to file if it changed since it was loaded or last saved."""
+        if self.high_score == self._saved_high_score:
+            return
+        with open(self._hs_path, "w") as f:
             f.write(str(self.high_score))
+        self._saved_high_score = self.high_score
 
     def _reset_game(self) -> None:
         """Reset game state for a new round."""
-        self.snake = [
-            SnakeSegment(GRID_WIDTH // 2, GRID_HEIGHT // 2),
-            SnakeSegment(GRID_WIDTH // 2 - 1, GRID_HEIGHT // 2),
-            SnakeSegment(GRID_WIDTH // 2 - 2, GRID_HEIGHT // 2),
-        ]
+        center = GRID_HEIGHT // 2 * GRID_WIDTH + GRID_WIDTH // 2
+        self.snake = deque([center, center - 1, center - 2])
+        self.occupied = set(self.snake)
         self.direction = Position(1, 0)
         self.next_direction = Position(1, 0)
         self.score = 0
         self.game_over = False
         self.paused = False
         self._spawn_food()
+        self._dirty = self._full_redraw = True
 
     def _spawn_food(self) -> None:
         """Spawn food at a random position."""
-        while True:
-            self.food = Position(
-                pygame.time.get_ticks() % GRID_WIDTH,
-                (pygame.time.get_ticks() // 1000) % GRID_HEIGHT
-            )
-            # Ensure food doesn't spawn on snake
-            if not any(segment.x == self.food.x and segment.y == self.food.y for segment in self.snake):
-                break
+        if len(self.occupied) < GRID_WIDTH * GRID_HEIGHT // 2:
+            # Mostly empty grid: rejection sampling needs fewer than two tries on average
+            while True:
+                key = random.randrange(GRID_WIDTH * GRID_HEIGHT)
+                # Ensure food doesn't spawn on snake
+                if key not in self.occupied:
+                    break
+        else:
+            # Mostly full grid: pick straight from the free cells
+            free_cells = set(range(GRID_WIDTH * GRID_HEIGHT)) - self.occupied
+            if not free_cells:
+                self._handle_game_over()
+                return
+            key = random.choice(tuple(free_cells))
+        self.food = Position(key % GRID_WIDTH, key // GRID_WIDTH)
 
     def _handle_input(self) -> None:
         """Handle user input."""
-        for event in pygame.event.get():
+        for event in pygame.event.get(self._events_mask):
             if event.type == pygame.QUIT:
                 pygame.quit()
                 sys.exit()
+            elif event.type == pygame.WINDOWEXPOSED:
+                self._dirty = self._full_redraw = True
             elif event.type == pygame.MOUSEBUTTONDOWN:
                 if self.game_over:
                     self._reset_game()
@@ -139,18 +201,14 @@ class SnakeGame:
                     sys.exit()
                 elif event.key == pygame.K_p and not self.game_over:
                     self.paused = not self.paused
+                    self._dirty = self._full_redraw = True
                 elif self.game_over:
                     self._reset_game()
                 else:
-                    # Update direction based on key press
-                    if event.key in (pygame.K_UP, pygame.K_w) and self.direction.y != 1:
-                        self.next_direction = Position(0, -1)
-                    elif event.key in (pygame.K_DOWN, pygame.K_s) and self.direction.y != -1:
-                        self.next_direction = Position(0, 1)
-                    elif event.key in (pygame.K_LEFT, pygame.K_a) and self.direction.x != 1:
-                        self.next_direction = Position(-1, 0)
-                    elif event.key in (pygame.K_RIGHT, pygame.K_d) and self.direction.x != -1:
-                        self.next_direction = Position(1, 0)
+                    # Update direction based on key press, ignoring reversals
+                    d = self._dir_table.get(event.key)
+                    if d and (d[0] + self.direction.x, d[1] + self.direction.y) != (0, 0):
+                        self.next_direction = d
 
     def _update(self) -> None:
         """Update game state."""
@@ -158,120 +216,169 @@ class SnakeGame:
             return
 
         # Update direction
-        self.direction = self.next_direction
+        direction = self.direction = self.next_direction
+        snake = self.snake
+        occupied = self.occupied
 
         # Calculate new head position
-        head_x = self.snake[0].x + self.direction.x
-        head_y = self.snake[0].y + self.direction.y
+        head_y, head_x = divmod(snake[0], GRID_WIDTH)
+        head_x += direction.x
+        head_y += direction.y
 
-        # Check for wall collision
-        if head_x < 0 or head_x >= GRID_WIDTH or head_y < 0 or head_y >= GRID_HEIGHT:
+        # Check for wall collision (a negative coordinate makes head_x | head_y negative)
+        if (head_x | head_y) < 0 or head_x >= GRID_WIDTH or head_y >= GRID_HEIGHT:
             self._handle_game_over()
             return
 
         # Check for self collision
-        if any(segment.x == head_x and segment.y == head_y for segment in self.snake):
+        head_key = head_y * GRID_WIDTH + head_x
+        if head_key in occupied:
             self._handle_game_over()
             return
 
         # Add new head
-        self.snake.insert(0, SnakeSegment(head_x, head_y))
+        occupied.add(head_key)
+        snake.appendleft(head_key)
+        dirty_cells = self._dirty_cells
 
         # Check for food collision
-        if head_x == self.food.x and head_y == self.food.y:
+        food = self.food
+        if head_x == food.x and head_y == food.y:
             self.score += 10
             self._update_high_score()
             self._spawn_food()
+            self._full_redraw = True
         else:
             # Remove tail if no food eaten
-            self.snake.pop()
+            tail_key = snake.pop()
+            occupied.discard(tail_key)
+            dirty_cells.append(tail_key)
+        dirty_cells.append(head_key)
+        self._dirty = True
 
     def _handle_game_over(self) -> None:
         """Handle game over state."""
         self.game_over = True
-        if self.score > self.high_score:
-            self.high_score = self.score
-            self._save_high_score()
+        self._dirty = self._full_redraw = True
+        self._update_high_score()
+
+        # Compose the overlay and its text once; the scores can't change until the next round
+        self._game_over_surf = self._overlay.copy()
+        score_msg = self.font.render(f"Final Score: {self.score}", True, COLOR_SCORE)
+        high_score_msg = self.font.render(f"High Score: {self.high_score}", True, COLOR_SCORE)
+        for text, y in (
+            (self._game_over_text, SCREEN_HEIGHT // 2 - 80),
+            (score_msg, SCREEN_HEIGHT // 2 - 20),
+            (high_score_msg, SCREEN_HEIGHT // 2 + 10),
+            (self._restart_text, SCREEN_HEIGHT // 2 + 60),
+        ):
+            self._game_over_surf.blit(text, (SCREEN_WIDTH // 2 - text.get_width() // 2, y))
 
     def _update_high_score(self) -> None:
         """Update high score if current score is new record."""
         if self.score > self.high_score:
             self.high_score = self.score
 
+    def _draw_cells(self) -> bool:
+        """Repaint only the cells in _dirty_cells.
+
+        Returns False without drawing anything if a cell lies under the
+        score text, in which case the caller has to redraw everything.
+        """
+        # Plain (x, y, w, h) tuples; fill, blit and display.update all accept them
+        px = self._px
+        rects = [
+            (px[key % GRID_WIDTH], px[key // GRID_WIDTH], GRID_SIZE - 2, GRID_SIZE - 2)
+            for key in self._dirty_cells
+        ]
+        if any(hud.colliderect(rect) for hud in self._hud_rects for rect in rects):
+            return False
+
+        for key, rect in zip(self._dirty_cells, rects):
+            if key in self.occupied:
+                self.screen.blit(self._snake_tile, rect)
+            else:
+                self.screen.fill(COLOR_BG, rect)
+
+        self._dirty_cells.clear()
+        pygame.display.update(rects)
+        return True
+
     def _draw(self) -> None:
         """Draw game elements."""
+        if not self._full_redraw and self._dirty_cells and self._draw_cells():
+            return
+
         self.screen.fill(COLOR_BG)
 
         # Draw snake
-        for segment in self.snake:
-            rect = pygame.Rect(
-                segment.x * GRID_SIZE,
-                segment.y * GRID_SIZE,
-                GRID_SIZE - 2,
-                GRID_SIZE - 2
-            )
-            pygame.draw.rect(self.screen, COLOR_SNAKE, rect)
+        tile = self._snake_tile
+        px = self._px
+        self.screen.blits(
+            [(tile, (px[key % GRID_WIDTH], px[key // GRID_WIDTH])) for key in self.snake], doreturn=False
+        )
 
         # Draw food
-        food_rect = pygame.Rect(
-            self.food.x * GRID_SIZE,
-            self.food.y * GRID_SIZE,
-            GRID_SIZE - 2,
-            GRID_SIZE - 2
+        self.screen.fill(
+            COLOR_FOOD,
+            (px[self.food.x], px[self.food.y], GRID_SIZE - 2, GRID_SIZE - 2)
         )
-        pygame.draw.rect(self.screen, COLOR_FOOD, food_rect)
 
         # Draw score and high score
-        score_text = self.font.render(f"Score: {self.score}", True, COLOR_SCORE)
-        high_score_text = self.font.render(f"High Score: {self.high_score}", True, COLOR_SCORE)
-        self.screen.blit(score_text, (SCREEN_WIDTH // 2 - score_text.get_width() // 2, 10))
-        self.screen.blit(high_score_text, (SCREEN_WIDTH // 2 - high_score_text.get_width() // 2, 40))
+        if self._score_cache[0] != self.score:
+            self._score_cache = (self.score, self.font.render(f"Score: {self.score}", True, COLOR_SCORE))
+        if self._hs_cache[0] != self.high_score:
+            self._hs_cache = (self.high_score, self.font.render(f"High Score: {self.high_score}", True, COLOR_SCORE))
+        score_text = self._score_cache[1]
+        high_score_text = self._hs_cache[1]
+        self._hud_rects = [
+            self.screen.blit(score_text, (SCREEN_WIDTH // 2 - score_text.get_width() // 2, 10)),
+            self.screen.blit(high_score_text, (SCREEN_WIDTH // 2 - high_score_text.get_width() // 2, 40)),
+        ]
 
         # Draw game over screen
         if self.game_over:
-            overlay = pygame.Surface((SCREEN_WIDTH, SCREEN_HEIGHT), pygame.SRCALPHA)
-            overlay.fill((0, 0, 0, 180))
-            self.screen.blit(overlay, (0, 0))
-
-            game_over_text = self.game_over_font.render("GAME OVER", True, COLOR_GAME_OVER)
-            score_msg = self.font.render(f"Final Score: {self.score}", True, COLOR_SCORE)
-            high_score_msg = self.font.render(f"High Score: {self.high_score}", True, COLOR_SCORE)
-            restart_msg = self.font.render("Click to restart or press any key", True, (150, 150, 150))
-
-            self.screen.blit(
-                game_over_text,
-                (SCREEN_WIDTH // 2 - game_over_text.get_width() // 2, SCREEN_HEIGHT // 2 - 80)
-            )
-            self.screen.blit(
-                score_msg,
-                (SCREEN_WIDTH // 2 - score_msg.get_width() // 2, SCREEN_HEIGHT // 2 - 20)
-            )
-            self.screen.blit(
-                high_score_msg,
-                (SCREEN_WIDTH // 2 - high_score_msg.get_width() // 2, SCREEN_HEIGHT // 2 + 10)
-            )
-            self.screen.blit(
-                restart_msg,
-                (SCREEN_WIDTH // 2 - restart_msg.get_width() // 2, SCREEN_HEIGHT // 2 + 60)
-            )
+            self.screen.blit(self._game_over_surf, (0, 0))
 
         # Draw pause screen
         if self.paused and not self.game_over:
-            pause_text = self.game_over_font.render("PAUSED", True, COLOR_PAUSE)
+            pause_text = self._pause_text
             self.screen.blit(
                 pause_text,
                 (SCREEN_WIDTH // 2 - pause_text.get_width() // 2, SCREEN_HEIGHT // 2)
             )
 
+        self._full_redraw = False
+        self._dirty_cells.clear()
         pygame.display.flip()
 
     def run(self) -> None:
-        """Main game loop."""
+        """Main game loop.
+
+        Game logic advances in fixed steps of 1 / SNAKE_SPEED seconds, while
+        input and drawing run at RENDER_FPS (IDLE_FPS when nothing moves).
+        """
+        step = 1 / SNAKE_SPEED
+        accumulator = 0.0
+        last = time.perf_counter()
         while True:
+            now = time.perf_counter()
+            # Cap the backlog so a stall doesn't fast-forward the snake
+            accumulator = min(accumulator + now - last, 3 * step)
+            last = now
+
             self._handle_input()
-            self._update()
-            self._draw()
-            self.clock.tick(SNAKE_SPEED)
+            idle = self.paused or self.game_over
+            if idle:
+                accumulator = 0.0
+            while accumulator >= step:
+                self._update()
+                accumulator -= step
+
+            if self._dirty:
+                self._draw()
+                self._dirty = False
+            self.clock.tick(IDLE_FPS if idle else RENDER_FPS)
 
 if __name__ == "__main__":
     game = SnakeGame()